@@ -9,6 +9,33 @@ import (
 	"github.com/go-redis/redis/v8"
 )
 
+const (
+	// latestTTL is how long a device's latest telemetry stays cached
+	latestTTL = 10 * time.Minute
+
+	// latestIndexKey is a sorted set of "tenant:device" members scored by the
+	// expiry time of their latest:* key (unix ms, Redis server clock). Readers
+	// count live devices with ZCOUNT from the server's current TIME to +inf,
+	// which stays correct while no writes arrive. Entries that have expired
+	// are also trimmed on every write. It lives outside the latest: namespace
+	// so latest:* scans only see per-device keys.
+	latestIndexKey = "index:latest"
+)
+
+// setLatestScript caches the telemetry and records its expiry in the index.
+// Scores come from Redis TIME so they share a clock with key expiry and with
+// readers on other hosts.
+// KEYS[1] = latest:* key, KEYS[2] = index key
+// ARGV[1] = payload, ARGV[2] = index member, ARGV[3] = TTL in ms
+var setLatestScript = redis.NewScript(`
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[3])
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[3]), ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', '(' .. now)
+return 1
+`)
+
 type RedisClient struct {
 	client *redis.Client
 }
@@ -49,8 +76,11 @@ func (r *RedisClient) SetLatest(ctx context.Context, tenantID, deviceID string,
 		return fmt.Errorf("failed to marshal data: %w", err)
 	}
 
-	// Cache for 10 minutes
-	err = r.client.Set(ctx, key, jsonData, 10*time.Minute).Err()
+	// Cache for 10 minutes and record the expiry in the index atomically
+	err = setLatestScript.Run(ctx, r.client,
+		[]string{key, latestIndexKey},
+		jsonData, tenantID+":"+deviceID, latestTTL.Milliseconds(),
+	).Err()
 	if err != nil {
 		return fmt.Errorf("failed to set cache: %w", err)
 	}
@@ -0,0 +1,130 @@
+package cache
+
+import (
+	"context"
+	"os"
+	"strconv"
+	"testing"
+	"time"
+
+	"github.com/go-redis/redis/v8"
+)
+
+// newTestClient connects to a local Redis (REDIS_ADDR, default localhost:6379)
+// on DB 15 and flushes it around each test. Tests are skipped if Redis is not running.
+func newTestClient(t *testing.T) *RedisClient {
+	t.Helper()
+
+	addr := os.Getenv("REDIS_ADDR")
+	if addr == "" {
+		addr = "localhost:6379"
+	}
+	client := redis.NewClient(&redis.Options{Addr: addr, DB: 15})
+
+	ctx := context.Background()
+	if err := client.Ping(ctx).Err(); err != nil {
+		client.Close()
+		t.Skipf("Redis not available at %s: %v", addr, err)
+	}
+	if err := client.FlushDB(ctx).Err(); err != nil {
+		t.Fatalf("failed to flush test DB: %v", err)
+	}
+	t.Cleanup(func() {
+		client.FlushDB(context.Background())
+		client.Close()
+	})
+
+	return &RedisClient{client: client}
+}
+
+// redisNowMs returns the Redis server clock in unix milliseconds
+func redisNowMs(t *testing.T, r *RedisClient) float64 {
+	t.Helper()
+
+	now, err := r.client.Time(context.Background()).Result()
+	if err != nil {
+		t.Fatalf("TIME failed: %v", err)
+	}
+	return float64(now.UnixMilli())
+}
+
+func TestSetLatestSetsKeyTTL(t *testing.T) {
+	r := newTestClient(t)
+	ctx := context.Background()
+
+	if err := r.SetLatest(ctx, "acme", "watch-0001", LatestTelemetry{DeviceID: "watch-0001", HeartRate: 72}); err != nil {
+		t.Fatalf("SetLatest failed: %v", err)
+	}
+
+	ttl, err := r.client.PTTL(ctx, "latest:acme:watch-0001").Result()
+	if err != nil {
+		t.Fatalf("PTTL failed: %v", err)
+	}
+	if ttl <= latestTTL-5*time.Second || ttl > latestTTL {
+		t.Errorf("TTL = %v, want close to %v", ttl, latestTTL)
+	}
+
+	got, err := r.GetLatest(ctx, "acme", "watch-0001")
+	if err != nil {
+		t.Fatalf("GetLatest failed: %v", err)
+	}
+	if got.DeviceID != "watch-0001" || got.HeartRate != 72 {
+		t.Errorf("GetLatest = %+v, want device watch-0001 with hr 72", got)
+	}
+}
+
+func TestSetLatestIndexesDeviceByExpiry(t *testing.T) {
+	r := newTestClient(t)
+	ctx := context.Background()
+
+	if err := r.SetLatest(ctx, "acme", "watch-0001", LatestTelemetry{DeviceID: "watch-0001"}); err != nil {
+		t.Fatalf("SetLatest failed: %v", err)
+	}
+
+	score, err := r.client.ZScore(ctx, latestIndexKey, "acme:watch-0001").Result()
+	if err != nil {
+		t.Fatalf("device missing from %s: %v", latestIndexKey, err)
+	}
+	want := redisNowMs(t, r) + float64(latestTTL.Milliseconds())
+	if diff := want - score; diff < 0 || diff > 5000 {
+		t.Errorf("index score = %v, want key expiry ~%v", score, want)
+	}
+
+	// Live devices are the members expiring after the server's current time
+	nowMs := strconv.FormatFloat(redisNowMs(t, r), 'f', 0, 64)
+	count, err := r.client.ZCount(ctx, latestIndexKey, nowMs, "+inf").Result()
+	if err != nil {
+		t.Fatalf("ZCOUNT failed: %v", err)
+	}
+	if count != 1 {
+		t.Errorf("%d live devices in index, want 1", count)
+	}
+}
+
+func TestSetLatestTrimsExpiredIndexEntries(t *testing.T) {
+	r := newTestClient(t)
+	ctx := context.Background()
+
+	now := redisNowMs(t, r)
+	if err := r.client.ZAdd(ctx, latestIndexKey,
+		&redis.Z{Score: now - 1000, Member: "acme:expired"},
+		&redis.Z{Score: now + 60000, Member: "acme:live"},
+	).Err(); err != nil {
+		t.Fatalf("ZADD failed: %v", err)
+	}
+
+	if err := r.SetLatest(ctx, "acme", "watch-0001", LatestTelemetry{DeviceID: "watch-0001"}); err != nil {
+		t.Fatalf("SetLatest failed: %v", err)
+	}
+
+	if err := r.client.ZScore(ctx, latestIndexKey, "acme:expired").Err(); err != redis.Nil {
+		t.Errorf("expired member still in index (err = %v)", err)
+	}
+	members, err := r.client.ZRange(ctx, latestIndexKey, 0, -1).Result()
+	if err != nil {
+		t.Fatalf("ZRANGE failed: %v", err)
+	}
+	if len(members) != 2 || members[0] != "acme:live" || members[1] != "acme:watch-0001" {
+		t.Errorf("index members = %v, want [acme:live acme:watch-0001]", members)
+	}
+}
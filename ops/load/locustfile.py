@@ -1,8 +1,13 @@
-from locust import HttpUser, task, between, events
-import json
+from locust import task, between, events
+from locust.contrib.fasthttp import FastHttpUser
+from array import array
+import itertools
+import orjson
 import time
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
-class HealthSenseAPIUser(HttpUser):
+class HealthSenseAPIUser(FastHttpUser):
     # """
     # Simulates a dashboard user making API calls
     # """
@@ -12,6 +17,7 @@ class HealthSenseAPIUser(HttpUser):
         """Called when a user starts"""
         self.tenant_id = "acme-clinic"
         self.device_ids = [f"watch-{i:04d}" for i in range(10)]  # 10 devices
+        self.device_cycle = itertools.cycle(self.device_ids)
     
     @task(3)  # Weight: 3x more likely than other tasks
     def get_all_devices(self):
@@ -22,7 +28,7 @@ class HealthSenseAPIUser(HttpUser):
             catch_response=True
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data.get("count", 0) > 0:
                     response.success()
                 else:
@@ -33,7 +39,7 @@ class HealthSenseAPIUser(HttpUser):
     @task(1)  # Weight: 1x
     def get_device_latest(self):
         """Get latest data for a specific device"""
-        device_id = self.device_ids[int(time.time()) % len(self.device_ids)]
+        device_id = next(self.device_cycle)
         with self.client.get(
             f"/api/v1/devices/{device_id}/latest",
             params={"tenant_id": self.tenant_id},
@@ -70,7 +76,7 @@ class HealthSenseAPIUser(HttpUser):
         """Health check endpoint"""
         with self.client.get("/health", catch_response=True) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data.get("status") == "healthy":
                     response.success()
                 else:
@@ -80,25 +86,28 @@ class HealthSenseAPIUser(HttpUser):
 
 
 # Custom metrics collection
-response_times = []
+# Stored column-wise in typed arrays rather than one dict per request
+response_endpoints = []
+response_times = array('f')
+response_timestamps = array('d')
 
 @events.request.add_listener
 def record_response_time(request_type, name, response_time, response_length, exception, **kwargs):
     """Record response times for later analysis"""
     if exception is None:
-        response_times.append({
-            'endpoint': name,
-            'response_time': response_time,
-            'timestamp': time.time()
-        })
+        response_endpoints.append(name)
+        response_times.append(response_time)
+        response_timestamps.append(time.time())
 
 @events.quitting.add_listener
 def save_results(environment, **kwargs):
     """Save results when test completes"""
     if response_times:
-        import csv
-        with open('../../docs/locust-results.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['endpoint', 'response_time', 'timestamp'])
-            writer.writeheader()
-            writer.writerows(response_times)
+        # Typed arrays are wrapped as Arrow columns without copying
+        tbl = pa.table({
+            'endpoint': pa.array(response_endpoints, type=pa.string()),
+            'response_time': pa.Array.from_buffers(pa.float32(), len(response_times), [None, pa.py_buffer(response_times)]),
+            'timestamp': pa.Array.from_buffers(pa.float64(), len(response_timestamps), [None, pa.py_buffer(response_timestamps)])
+        })
+        pacsv.write_csv(tbl, '../../docs/locust-results.csv')
         print(f"\n✅ Saved {len(response_times)} response times to docs/locust-results.csv")
\ No newline at end of file
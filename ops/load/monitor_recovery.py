@@ -1,20 +1,92 @@
 import time
 import redis
 import subprocess
-import csv
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
 
 # Connect to Redis
 r = redis.Redis(host='localhost', port=6379, decode_responses=True)
 
+# The consumer records every latest:* write in a sorted set scored by the key's expiry
+# time in Redis server milliseconds (see backend/pkg/cache/redis.go). Counting members
+# that expire after Redis's own TIME needs no key scan, no local clock and no copy of
+# the TTL, and still drops while the consumer is down and not writing
+LATEST_INDEX = 'index:latest'
+
+# Minimum seconds between count re-checks while waiting for recovery; index writes
+# arrive hundreds of times per second at the larger device counts
+RECHECK_INTERVAL = 0.5
+
+# Wake on index writes (keyspace notifications, K = keyspace channel, z = sorted set
+# events) instead of polling; enabled by run_test() if the server allows CONFIG SET
+KEYSPACE_PREFIX = '__keyspace@0__:'
+KEYSPACE_FLAGS = 'Kz'
+keyspace_events = False
+
 results = []
 
+def subscribe_index():
+    """Subscribe to index write events, or return None if notifications are unavailable"""
+    if not keyspace_events:
+        return None
+    ps = r.pubsub(ignore_subscribe_messages=True)
+    ps.subscribe(KEYSPACE_PREFIX + LATEST_INDEX)
+    return ps
+
+def wait_for_count(ps, target, timeout):
+    """Wait up to `timeout` seconds, returning early once `target` devices are cached"""
+    if ps is None:
+        time.sleep(timeout)
+        return
+    deadline = time.monotonic() + timeout
+    next_check = time.monotonic()
+    pending = False
+    while True:
+        now = time.monotonic()
+        if now >= deadline:
+            return
+        # Index writes only mark the count as stale; re-count at most every RECHECK_INTERVAL
+        if pending and now >= next_check:
+            if get_latest_counts() >= target:
+                return
+            pending = False
+            next_check = now + RECHECK_INTERVAL
+        wait = deadline - now
+        if pending:
+            wait = min(wait, next_check - now)
+        if ps.get_message(timeout=wait) is not None:
+            pending = True
+
 def get_latest_counts():
     """Get number of devices with recent data in Redis"""
-    keys = r.keys('latest:*')
-    return len(keys)
+    sec, usec = r.time()
+    return r.zcount(LATEST_INDEX, sec * 1000 + usec // 1000, '+inf')
+
+def save_results(path):
+    """Write collected results to CSV in one Arrow table write"""
+    pacsv.write_csv(pa.Table.from_pylist(results), path)
 
 def run_test():
+    """Run the test with keyspace notifications enabled, restoring the server setting afterwards"""
+    global keyspace_events
+    try:
+        old_flags = r.config_get('notify-keyspace-events')['notify-keyspace-events']
+        # Add our flags on top of whatever the server already uses
+        r.config_set('notify-keyspace-events', ''.join(sorted(set(old_flags) | set(KEYSPACE_FLAGS))))
+    except redis.ResponseError as e:
+        print(f"⚠️  Keyspace notifications unavailable ({e}); falling back to 5s polling")
+        run_phases()
+        return
+
+    keyspace_events = True
+    try:
+        run_phases()
+    finally:
+        keyspace_events = False
+        r.config_set('notify-keyspace-events', old_flags)
+
+def run_phases():
     print("=" * 70)
     print("FAILURE RECOVERY TEST")
     print("=" * 70)
@@ -87,35 +159,40 @@ def run_test():
     print("\n📈 Phase 5: Monitoring Recovery (90s)")
     print("   Watching cache repopulation...")
     
-    for i in range(18):
-        time.sleep(5)
-        cached = get_latest_counts()
-        age = (datetime.now() - recovery_start).seconds
+    # Subscribe only for this phase so index events can't pile up unread during the
+    # earlier sleeps and operator prompts
+    ps = subscribe_index()
+    try:
+        for i in range(18):
+            # Wakes as soon as the last device is back instead of at the next 5s tick
+            wait_for_count(ps, baseline, 5)
+            cached = get_latest_counts()
+            age = (datetime.now() - recovery_start).seconds
         
-        # Check if fully recovered
-        if cached >= baseline:
-            print(f"   [{age}s] ✅ FULLY RECOVERED! All {cached} devices cached")
-            results.append({
-                'timestamp': datetime.now().isoformat(),
-                'phase': 'recovered',
-                'devices_cached': cached,
-                'notes': f'Full recovery in {age}s'
-            })
-            break
-        else:
-            print(f"   [{age}s] Cached devices: {cached}/{baseline} ({cached/baseline*100:.1f}%)")
-            results.append({
-                'timestamp': datetime.now().isoformat(),
-                'phase': 'recovering',
-                'devices_cached': cached,
-                'notes': f'Recovery progress {age}s'
-            })
+            # Check if fully recovered
+            if cached >= baseline:
+                print(f"   [{age}s] ✅ FULLY RECOVERED! All {cached} devices cached")
+                results.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'phase': 'recovered',
+                    'devices_cached': cached,
+                    'notes': f'Full recovery in {age}s'
+                })
+                break
+            else:
+                print(f"   [{age}s] Cached devices: {cached}/{baseline} ({cached/baseline*100:.1f}%)")
+                results.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'phase': 'recovering',
+                    'devices_cached': cached,
+                    'notes': f'Recovery progress {age}s'
+                })
+    finally:
+        if ps is not None:
+            ps.close()
     
     # Save results
-    with open('../../docs/recovery-test-results.csv', 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['timestamp', 'phase', 'devices_cached', 'notes'])
-        writer.writeheader()
-        writer.writerows(results)
+    save_results('../../docs/recovery-test-results.csv')
     
     print("\n" + "=" * 70)
     print("TEST COMPLETE")
@@ -133,8 +210,5 @@ if __name__ == "__main__":
         print("\n\n⚠️  Test interrupted by user")
         # Save partial results
         if results:
-            with open('../../docs/recovery-test-results-partial.csv', 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=['timestamp', 'phase', 'devices_cached', 'notes'])
-                writer.writeheader()
-                writer.writerows(results)
+            save_results('../../docs/recovery-test-results-partial.csv')
             print("📊 Partial results saved")
\ No newline at end of file
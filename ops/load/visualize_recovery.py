@@ -1,59 +1,127 @@
+import math
 import pandas as pd
-import matplotlib.pyplot as plt
+from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 
+# Fixed-layout chart drawn straight into a Pillow image (no matplotlib figure machinery)
+WIDTH, HEIGHT = 2400, 1200
+LEFT, RIGHT, TOP, BOTTOM = 180, 60, 110, 140
+PLOT_W = WIDTH - LEFT - RIGHT
+PLOT_H = HEIGHT - TOP - BOTTOM
+
+title_font = ImageFont.load_default(size=44)
+label_font = ImageFont.load_default(size=36)
+tick_font = ImageFont.load_default(size=28)
+
+def nice_ticks(vmax, count=6):
+    """0-based ticks with a 1/2/5 step covering vmax"""
+    vmax = max(vmax, 1)
+    step = 10 ** math.floor(math.log10(vmax / count))
+    for mult in (1, 2, 5, 10):
+        if vmax / (step * mult) <= count:
+            step *= mult
+            break
+    return [i * step for i in range(math.ceil(vmax / step) + 1)]
+
+def dashed_vline(draw, x, color, width=4, dash=18, gap=12):
+    for y in range(TOP, TOP + PLOT_H, dash + gap):
+        draw.line([(x, y), (x, min(y + dash, TOP + PLOT_H))], fill=color, width=width)
+
 # Read results
 df = pd.read_csv('../../docs/recovery-test-results.csv')
 df['timestamp'] = pd.to_datetime(df['timestamp'])
 df['seconds'] = (df['timestamp'] - df['timestamp'].iloc[0]).dt.total_seconds()
 
-# Create visualization
-fig, ax = plt.subplots(figsize=(12, 6))
+x_ticks = nice_ticks(df['seconds'].max())
+y_ticks = nice_ticks(df['devices_cached'].max() * 1.1)
+x_hi, y_hi = x_ticks[-1], y_ticks[-1]
 
-# Plot cached devices over time
-ax.plot(df['seconds'], df['devices_cached'], 
-        marker='o', linewidth=2, markersize=6, color='#3b82f6')
+def px(x):
+    return LEFT + x / x_hi * PLOT_W
+
+def py(y):
+    return TOP + PLOT_H - y / y_hi * PLOT_H
 
-# Mark phases
-phases = df.groupby('phase')['seconds'].agg(['min', 'max'])
+# Create visualization
+img = Image.new('RGBA', (WIDTH, HEIGHT), 'white')
 
-# Shade regions
+# Mark phases (one groupby pass; 'first' gives the marker time of single-row phases)
+phases = df.groupby('phase', observed=True)['seconds'].agg(['min', 'max', 'first'])
+
+# Shade regions on a translucent overlay
+spans = []
 if 'baseline' in phases.index:
-    ax.axvspan(phases.loc['baseline', 'min'], phases.loc['baseline', 'max'], 
-               alpha=0.2, color='green', label='Normal Operation')
+    spans.append((phases.loc['baseline', 'min'], phases.loc['baseline', 'max'],
+                  (0, 128, 0, 51), 'Normal Operation'))
 
 if 'downtime' in phases.index:
-    ax.axvspan(phases.loc['downtime', 'min'], phases.loc['downtime', 'max'], 
-               alpha=0.3, color='red', label='Consumer Down')
+    spans.append((phases.loc['downtime', 'min'], phases.loc['downtime', 'max'],
+                  (255, 0, 0, 77), 'Consumer Down'))
+
+failure_point = phases.loc['failure', 'first'] if 'failure' in phases.index else None
+recovery_point = phases.loc['recovery_start', 'first'] if 'recovery_start' in phases.index else None
 
 if 'recovering' in phases.index or 'recovered' in phases.index:
-    recovery_start = df[df['phase'] == 'recovery_start']['seconds'].iloc[0] if 'recovery_start' in df['phase'].values else phases.loc['recovering', 'min']
-    recovery_end = df[df['phase'].isin(['recovering', 'recovered'])]['seconds'].max()
-    ax.axvspan(recovery_start, recovery_end, 
-               alpha=0.2, color='yellow', label='Recovery')
+    recovery_start = recovery_point if recovery_point is not None else phases.loc['recovering', 'min']
+    recovery_end = phases.loc[phases.index.intersection(['recovering', 'recovered']), 'max'].max()
+    spans.append((recovery_start, recovery_end, (255, 255, 0, 51), 'Recovery'))
+
+overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+overlay_draw = ImageDraw.Draw(overlay)
+for start, end, fill, _ in spans:
+    overlay_draw.rectangle([px(start), TOP, px(end), TOP + PLOT_H], fill=fill)
+img = Image.alpha_composite(img, overlay)
+draw = ImageDraw.Draw(img)
+
+# Grid, ticks and frame
+for x in x_ticks:
+    draw.line([(px(x), TOP), (px(x), TOP + PLOT_H)], fill=(220, 220, 220), width=2)
+    draw.text((px(x), TOP + PLOT_H + 14), f'{x:g}', fill='black', font=tick_font, anchor='mt')
+for y in y_ticks:
+    draw.line([(LEFT, py(y)), (LEFT + PLOT_W, py(y))], fill=(220, 220, 220), width=2)
+    draw.text((LEFT - 14, py(y)), f'{y:g}', fill='black', font=tick_font, anchor='rm')
+draw.rectangle([LEFT, TOP, LEFT + PLOT_W, TOP + PLOT_H], outline='black', width=2)
+
+# Plot cached devices over time
+points = [(px(x), py(y)) for x, y in zip(df['seconds'], df['devices_cached'])]
+draw.line(points, fill='#3b82f6', width=5, joint='curve')
+for x, y in points:
+    draw.ellipse([x - 9, y - 9, x + 9, y + 9], fill='#3b82f6')
 
 # Annotations
-failure_point = df[df['phase'] == 'failure']['seconds'].iloc[0] if 'failure' in df['phase'].values else None
-if failure_point:
-    ax.axvline(failure_point, color='red', linestyle='--', linewidth=2)
-    ax.text(failure_point, ax.get_ylim()[1] * 0.9, 
-            '💥 Consumer Stopped', 
-            ha='right', fontsize=11, fontweight='bold', color='red')
-
-recovery_point = df[df['phase'] == 'recovery_start']['seconds'].iloc[0] if 'recovery_start' in df['phase'].values else None
-if recovery_point:
-    ax.axvline(recovery_point, color='green', linestyle='--', linewidth=2)
-    ax.text(recovery_point, ax.get_ylim()[1] * 0.8, 
-            '🔄 Consumer Restarted', 
-            ha='left', fontsize=11, fontweight='bold', color='green')
-
-ax.set_xlabel('Time (seconds)', fontsize=12)
-ax.set_ylabel('Devices with Cached Data', fontsize=12)
-ax.set_title('HealthSense Failure Recovery Test', fontsize=14, fontweight='bold')
-ax.grid(True, alpha=0.3)
-ax.legend(loc='lower left', fontsize=10)
-
-plt.tight_layout()
-plt.savefig('../../docs/recovery-test-visualization.png', dpi=300, bbox_inches='tight')
+if failure_point is not None:
+    dashed_vline(draw, px(failure_point), 'red')
+    draw.text((px(failure_point) - 10, py(y_hi * 0.9)), 'Consumer Stopped',
+              fill='red', font=label_font, anchor='rm')
+
+if recovery_point is not None:
+    dashed_vline(draw, px(recovery_point), 'green')
+    draw.text((px(recovery_point) + 10, py(y_hi * 0.8)), 'Consumer Restarted',
+              fill='green', font=label_font, anchor='lm')
+
+draw.text((LEFT + PLOT_W / 2, HEIGHT - 30), 'Time (seconds)', fill='black', font=label_font, anchor='md')
+draw.text((LEFT + PLOT_W / 2, TOP / 2), 'HealthSense Failure Recovery Test', fill='black', font=title_font, anchor='mm')
+
+# Y label is drawn horizontally, then rotated into place
+y_label = Image.new('RGBA', (PLOT_H, 60), (0, 0, 0, 0))
+ImageDraw.Draw(y_label).text((PLOT_H / 2, 30), 'Devices with Cached Data', fill='black', font=label_font, anchor='mm')
+y_label = y_label.rotate(90, expand=True)
+img.alpha_composite(y_label, (20, TOP))
+
+# Legend (lower left)
+row_h = 50
+legend_h = row_h * len(spans) + 20
+legend_top = TOP + PLOT_H - 20 - legend_h
+if spans:
+    draw.rectangle([LEFT + 20, legend_top, LEFT + 420, legend_top + legend_h],
+                   fill='white', outline=(200, 200, 200), width=2)
+legend_swatches = Image.new('RGBA', img.size, (0, 0, 0, 0))
+swatch_draw = ImageDraw.Draw(legend_swatches)
+for i, (_, _, fill, label) in enumerate(spans):
+    row_y = legend_top + 10 + i * row_h + row_h / 2
+    swatch_draw.rectangle([LEFT + 40, row_y - 14, LEFT + 100, row_y + 14], fill=fill)
+    draw.text((LEFT + 120, row_y), label, fill='black', font=tick_font, anchor='lm')
+img = Image.alpha_composite(img, legend_swatches)
+
+img.convert('RGB').save('../../docs/recovery-test-visualization.png')
 print("✅ Visualization saved: docs/recovery-test-visualization.png")
-plt.show()
\ No newline at end of file